@@ -1,12 +1,402 @@
 import sys
 import os
+import re
+import subprocess
+import tempfile
+import threading
+import queue
+from functools import lru_cache
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QPushButton, QLabel, 
                            QFileDialog, QProgressBar, QVBoxLayout, QWidget,
                            QSlider, QHBoxLayout, QSpinBox, QDoubleSpinBox)
 from PyQt5.QtCore import Qt, QThread, pyqtSignal
-from moviepy.editor import VideoFileClip, AudioFileClip, concatenate_videoclips, concatenate_audioclips
+from moviepy.editor import AudioFileClip, concatenate_audioclips
+from moviepy.config import get_setting
 import numpy as np
 
+try:
+    import numpy_rms
+except ImportError:
+    numpy_rms = None
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+try:
+    import av
+except ImportError:
+    av = None
+
+# Sample rate used when decoding audio for silence analysis
+ANALYSIS_FPS = 22050
+
+# Samples per packet for audio formats whose packets can be copied at span
+# edges; spans are snapped to this grid so no packet is cut in half
+COPY_FRAME_SAMPLES = {'.wav': 1, '.mp3': 1152, '.aac': 1024}
+
+# Keep ffmpeg from opening a console window on Windows, as moviepy does
+POPEN_PARAMS = {"creationflags": 0x08000000} if os.name == "nt" else {}
+
+NVENC_OPTIONS = {
+    "codec": "h264_nvenc",
+    "preset": "p4",
+    "ffmpeg_params": ["-rc", "vbr", "-cq", "23", "-pix_fmt", "yuv420p"],
+}
+
+X264_OPTIONS = {
+    "codec": "libx264",
+    "preset": "ultrafast",
+    "ffmpeg_params": ["-tune", "fastdecode", "-crf", "23", "-pix_fmt", "yuv420p"],
+}
+
+@lru_cache(maxsize=None)
+def nvenc_available():
+    # An encoder listed by "ffmpeg -encoders" can still fail without an NVIDIA GPU,
+    # so probe it with a tiny test encode instead, using the same options as the
+    # real encode since older drivers reject presets like p4
+    try:
+        result = subprocess.run(
+            [get_setting("FFMPEG_BINARY"), "-hide_banner", "-loglevel", "error",
+             "-f", "lavfi", "-i", "color=size=256x256:duration=0.1",
+             "-c:v", NVENC_OPTIONS["codec"], "-preset", NVENC_OPTIONS["preset"],
+             *NVENC_OPTIONS["ffmpeg_params"], "-f", "null", "-"],
+            capture_output=True,
+            **POPEN_PARAMS
+        )
+    except OSError:
+        return False
+    return result.returncode == 0
+
+def video_codec_options():
+    # Encoders to try in order: the GPU when possible, always backed by x264
+    if nvenc_available():
+        return [NVENC_OPTIONS, X264_OPTIONS]
+    return [X264_OPTIONS]
+
+def write_segment_encode(input_path, spans, output_path):
+    # Re-encode only the kept spans in one ffmpeg pass. segment/asegment cut
+    # both streams at every span edge, audio to the sample, and hand each
+    # frame to exactly one output; the gaps go to null sinks and the concat
+    # filter joins the spans. concat starts every span's video and audio
+    # together, so rounding at a cut can't pile up into drift over hundreds
+    # of spans. The graph goes in a script file so long span lists stay clear
+    # of command-line length limits. An NVENC encode that fails mid-file is
+    # retried once with x264. Returns False if ffmpeg fails
+    merged = []
+    for start, end in spans:
+        # segment needs strictly increasing cut points, so spans that touch
+        # become one
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    
+    cuts = "|".join(f"{edge:.6f}" for span in merged for edge in span)
+    # Output 2i is the gap before span i and 2i+1 is the span itself, moved
+    # to start at zero as concat expects
+    count = len(merged)
+    streams = (
+        ("v", "segment", "setpts", "nullsink"),
+        ("a", "asegment", "asetpts", "anullsink"),
+    )
+    with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as script:
+        for kind, segment, setpts, sink in streams:
+            script.write(
+                f"[0:{kind}]{segment}=timestamps='{cuts}'"
+                + "".join(f"[{kind}gap{i}][{kind}span{i}]" for i in range(count))
+                + f"[{kind}gap{count}];\n"
+            )
+            for i in range(count):
+                script.write(f"[{kind}span{i}]{setpts}=PTS-STARTPTS[{kind}{i}];\n")
+            for i in range(count + 1):
+                script.write(f"[{kind}gap{i}]{sink};\n")
+        script.write(
+            "".join(f"[v{i}][a{i}]" for i in range(count))
+            + f"concat=n={count}:v=1:a=1[v][a]"
+        )
+    
+    try:
+        for options in video_codec_options():
+            cmd = [get_setting("FFMPEG_BINARY"), "-y", "-loglevel", "error"]
+            if options["codec"] == NVENC_OPTIONS["codec"]:
+                # Decode on the GPU too when it is already doing the encode
+                cmd += ["-hwaccel", "cuda"]
+            cmd += [
+                "-i", input_path,
+                "-filter_complex_script", script.name,
+                "-map", "[v]", "-map", "[a]",
+                "-c:v", options["codec"], "-preset", options["preset"],
+                *options["ffmpeg_params"],
+                "-threads", str(os.cpu_count()),
+                "-c:a", "aac",
+                output_path,
+            ]
+            result = subprocess.run(cmd, capture_output=True, **POPEN_PARAMS)
+            if result.returncode == 0:
+                return True
+            if os.path.exists(output_path):
+                os.remove(output_path)
+    finally:
+        os.remove(script.name)
+    return False
+
+def snap_spans(spans, sample_rate, frame_samples):
+    # Round span edges to the nearest codec frame boundary, dropping any span
+    # that collapses to nothing
+    step = frame_samples / sample_rate
+    snapped = [(round(start / step) * step, round(end / step) * step) for start, end in spans]
+    return [(start, end) for start, end in snapped if end > start]
+
+INTRA_CODEC_RE = re.compile(r"^ [D.][E.]VI[L.][S.] (\w+)", re.MULTILINE)
+VIDEO_CODEC_RE = re.compile(r"Stream #\S+.*?: Video: (\w+)")
+
+@lru_cache(maxsize=None)
+def intra_only_codecs():
+    # Video codecs "ffmpeg -codecs" flags as intra frame-only
+    try:
+        result = subprocess.run(
+            [get_setting("FFMPEG_BINARY"), "-hide_banner", "-codecs"],
+            capture_output=True,
+            text=True,
+            errors="replace",
+            **POPEN_PARAMS
+        )
+    except OSError:
+        return frozenset()
+    return frozenset(INTRA_CODEC_RE.findall(result.stdout))
+
+def is_intra_only(input_path):
+    # A copied video stream can only be cut at a keyframe: the concat demuxer
+    # starts an inpoint anywhere else at the previous keyframe, bringing back
+    # the silence before it. Only intra-only codecs such as MJPEG make every
+    # frame a keyframe. Reading the codec from the header costs no decode, so
+    # ordinary long-GOP inputs go to the re-encode without a scan of the file
+    result = subprocess.run(
+        [get_setting("FFMPEG_BINARY"), "-hide_banner", "-i", input_path],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+        errors="replace",
+        **POPEN_PARAMS
+    )
+    match = VIDEO_CODEC_RE.search(result.stderr)
+    return match is not None and match.group(1) in intra_only_codecs()
+
+def write_concat_copy(input_path, spans, output_path):
+    # Join spans of one source with ffmpeg's concat demuxer, copying packets
+    # instead of re-encoding. Returns False if the streams can't be copied
+    source = os.path.abspath(input_path).replace("'", "'\\''")
+    with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as listfile:
+        for start, end in spans:
+            listfile.write(f"file '{source}'\ninpoint {start:.6f}\noutpoint {end:.6f}\n")
+    
+    try:
+        result = subprocess.run(
+            [get_setting("FFMPEG_BINARY"), "-y", "-loglevel", "error",
+             "-f", "concat", "-safe", "0", "-i", listfile.name,
+             "-c", "copy", output_path],
+            capture_output=True,
+            **POPEN_PARAMS
+        )
+    finally:
+        os.remove(listfile.name)
+    
+    if result.returncode != 0 and os.path.exists(output_path):
+        os.remove(output_path)
+    return result.returncode == 0
+
+if njit is not None:
+    @njit(fastmath=True, cache=True)
+    def loud_frames_jit(samples, frame_len, threshold):
+        # Compiled loud_frames: compare each frame's sum of squares against
+        # threshold**2 * frame_len, so no sqrt or division runs per frame
+        n_frames = len(samples) // frame_len
+        limit = threshold * threshold * frame_len
+        loud = np.empty(n_frames, dtype=np.bool_)
+        for i in range(n_frames):
+            total = 0.0
+            for j in range(i * frame_len, (i + 1) * frame_len):
+                total += samples[j] * samples[j]
+            loud[i] = total > limit
+        return loud
+else:
+    loud_frames_jit = None
+
+def loud_frames(samples, frame_len, threshold):
+    # Flag each non-overlapping frame_len frame of a mono float32 block whose
+    # RMS is above threshold. RMS never exceeds the peak, so frames that peak
+    # at or below the threshold are silent without measuring them
+    if loud_frames_jit is not None:
+        return loud_frames_jit(samples, frame_len, threshold)
+    
+    n_frames = len(samples) // frame_len
+    frames = samples[:n_frames * frame_len].reshape(n_frames, frame_len)
+    
+    peak = np.maximum(frames.max(axis=1, initial=0), -frames.min(axis=1, initial=0))
+    loud = np.zeros(n_frames, dtype=bool)
+    candidates = np.flatnonzero(peak > threshold)
+    if len(candidates):
+        uncertain = frames[candidates]
+        if numpy_rms is not None:
+            rms = numpy_rms.rms(uncertain.ravel(), window_size=frame_len)
+            loud[candidates] = rms > threshold
+        else:
+            # einsum squares and sums in one pass without a squared copy; the
+            # sum is compared against threshold**2 * frame_len, which skips the
+            # division and sqrt that turning it into an RMS would take
+            energy = np.einsum('ij,ij->i', uncertain, uncertain)
+            loud[candidates] = energy > threshold * threshold * frame_len
+    return loud
+
+def av_blocks(input_path):
+    # Decode the audio in-process with PyAV instead of through moviepy's ffmpeg
+    # pipe, resampled to planar float at the analysis rate and yielded in
+    # blocks of about one second
+    with av.open(input_path) as container:
+        stream = container.streams.audio[0]
+        stream.thread_type = "AUTO"
+        stream.thread_count = os.cpu_count()
+        resampler = av.AudioResampler(format="fltp", rate=ANALYSIS_FPS)
+        
+        pending = []
+        size = 0
+        for frame in container.decode(stream):
+            for resampled in resampler.resample(frame):
+                pending.append(resampled.to_ndarray())
+                size += resampled.samples
+            if size >= ANALYSIS_FPS:
+                yield np.concatenate(pending, axis=1)
+                pending = []
+                size = 0
+        pending.extend(resampled.to_ndarray() for resampled in resampler.resample(None))
+        if pending:
+            yield np.concatenate(pending, axis=1)
+
+def decode_blocks(audio, out_q, stop):
+    # Pipeline stage 1: stream decoded audio in one-second blocks, downmixed
+    # to mono float32 since loudness needs neither channels nor float64.
+    # Errors are passed down the queue and None marks the end; decoding
+    # stops early once stop is set
+    if av is not None:
+        blocks = av_blocks(audio.filename)
+        channel_axis = 0
+    else:
+        blocks = audio.iter_chunks(fps=ANALYSIS_FPS, chunksize=ANALYSIS_FPS)
+        channel_axis = 1
+    try:
+        for block in blocks:
+            if stop.is_set():
+                break
+            out_q.put(block.mean(axis=channel_axis, dtype=np.float32))
+    except Exception as e:
+        out_q.put(e)
+    finally:
+        # Closing the generator releases the PyAV container straight away
+        blocks.close()
+    out_q.put(None)
+
+def measure_blocks(in_q, out_q, frame_len, threshold, stop):
+    # Pipeline stage 2: cut blocks into whole frames and emit which are loud.
+    # A frame split across two blocks is completed in one reused buffer
+    # rather than by concatenating every block onto the leftover samples.
+    # Once stop is set, blocks are only drained until the decoder finishes
+    carry = np.empty(frame_len, dtype=np.float32)
+    filled = 0
+    while True:
+        block = in_q.get()
+        if block is None:
+            break
+        if stop.is_set():
+            continue
+        if isinstance(block, Exception):
+            out_q.put(block)
+            break
+        try:
+            if filled:
+                take = min(frame_len - filled, len(block))
+                carry[filled:filled + take] = block[:take]
+                filled += take
+                block = block[take:]
+                if filled < frame_len:
+                    continue
+                out_q.put(loud_frames(carry, frame_len, threshold))
+                filled = 0
+            
+            usable = len(block) - len(block) % frame_len
+            if usable:
+                out_q.put(loud_frames(block[:usable], frame_len, threshold))
+            filled = len(block) - usable
+            carry[:filled] = block[usable:]
+        except Exception as e:
+            out_q.put(e)
+            break
+    out_q.put(None)
+
+def drain_queue(q):
+    # Discard whatever is queued so a producer blocked on put() can go on
+    try:
+        while True:
+            q.get_nowait()
+    except queue.Empty:
+        pass
+
+RMS_LEVEL_RE = re.compile(r"lavfi\.astats\.Overall\.RMS_level=(\S+)")
+
+def detect_loud_frames(input_path, threshold, chunk_duration, channels, report):
+    # Measure each chunk's RMS in ffmpeg the same way analyze_rms does: the
+    # channels averaged by pan, resampled to the analysis rate and cut into
+    # chunk-long frames for astats. silencedetect would compare single samples
+    # against the threshold instead, which reads noise as silent only when it
+    # is around 11 dB quieter than the slider says. Levels are read as ffmpeg
+    # prints them, and report(seconds) is called with the audio measured so
+    # far about once a second of audio, as analyze_rms does per block.
+    # Returns the loud mask, or None if ffmpeg could not run the filters
+    frame_len = int(chunk_duration * ANALYSIS_FPS)
+    frames_per_report = max(1, round(1 / chunk_duration))
+    mix = "+".join(f"c{i}" for i in range(channels))
+    levels = []
+    with subprocess.Popen(
+        [get_setting("FFMPEG_BINARY"), "-hide_banner", "-nostats",
+         "-i", input_path, "-vn",
+         "-af", f"pan=mono|c0<{mix},aresample={ANALYSIS_FPS},"
+                f"asetnsamples=n={frame_len},"
+                "astats=metadata=1:reset=1:measure_perchannel=none:measure_overall=RMS_level,"
+                "ametadata=print:key=lavfi.astats.Overall.RMS_level",
+         "-f", "null", "-"],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+        errors="replace",
+        **POPEN_PARAMS
+    ) as process:
+        for line in process.stderr:
+            match = RMS_LEVEL_RE.search(line)
+            if match:
+                levels.append(match.group(1))
+                if len(levels) % frames_per_report == 0:
+                    report(len(levels) * chunk_duration)
+    if process.returncode != 0:
+        return None
+    
+    # astats reports RMS in dBFS, -inf for digital silence
+    return np.array(levels, dtype=float) > 20 * np.log10(threshold)
+
+def loud_spans(loud, chunk_duration, duration):
+    # Turn a per-frame loud mask into the (start, end) spans to keep. Runs of
+    # loud frames start where the padded mask rises and end where it falls,
+    # and each keeps one chunk of lead-in as the per-chunk loop did. Spans are
+    # plain floats; clip objects are only built if moviepy writes the output
+    mask = np.concatenate(([False], loud, [False]))
+    edges = np.diff(mask.astype(np.int8))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    return list(zip(
+        np.maximum(0, (starts - 1) * chunk_duration).tolist(),
+        np.minimum(duration, ends * chunk_duration).tolist()
+    ))
+
 class SilenceRemover(QThread):
     progress = pyqtSignal(int)
     status = pyqtSignal(str)
@@ -20,112 +410,157 @@ class SilenceRemover(QThread):
         self.chunk_duration = chunk_duration
         self.is_audio_only = input_path.lower().endswith(('.mp3', '.wav', '.ogg', '.flac', '.aac'))
         
+    def analyze_rms(self, audio, duration):
+        # Fallback for ffmpeg builds without astats: measure frame loudness
+        # in Python and return the (start, end) spans to keep.
+        # Decoding and loudness measurement run in their own threads, linked by
+        # bounded queues, so the next block decodes while this one is measured.
+        # The settings are read once into plain floats so the compiled kernel
+        # always sees the same argument types
+        threshold = float(self.threshold)
+        chunk_duration = float(self.chunk_duration)
+        frame_len = int(chunk_duration * ANALYSIS_FPS)
+        
+        decode_q = queue.Queue(maxsize=32)
+        loud_q = queue.Queue(maxsize=32)
+        stop = threading.Event()
+        threads = [
+            threading.Thread(target=decode_blocks, args=(audio, decode_q, stop), daemon=True),
+            threading.Thread(
+                target=measure_blocks,
+                args=(decode_q, loud_q, frame_len, threshold, stop),
+                daemon=True
+            ),
+        ]
+        for thread in threads:
+            thread.start()
+        
+        loud_blocks = []
+        measured = 0
+        chunk_count = max(1, int(duration / chunk_duration))
+        try:
+            while True:
+                block_loud = loud_q.get()
+                if block_loud is None:
+                    break
+                if isinstance(block_loud, Exception):
+                    raise block_loud
+                loud_blocks.append(block_loud)
+                measured += len(block_loud)
+                self.progress.emit(10 + int(min(measured / chunk_count, 1) * 30))
+        finally:
+            # If either stage failed, stop decoding and keep both queues empty
+            # until the threads exit, so none is left blocked on a full queue
+            # holding the file open
+            stop.set()
+            for thread in threads:
+                while thread.is_alive():
+                    drain_queue(decode_q)
+                    drain_queue(loud_q)
+                    thread.join(timeout=0.05)
+        loud = np.concatenate(loud_blocks) if loud_blocks else np.zeros(0, dtype=bool)
+        self.progress.emit(40)
+        
+        self.status.emit("Detecting silent parts...")
+        return loud_spans(loud, chunk_duration, duration)
+    
     def run(self):
+        audio = None
         try:
             self.status.emit("Loading media...")
             
-            if self.is_audio_only:
-                media = AudioFileClip(self.input_path)
-                audio = media
-            else:
-                media = VideoFileClip(self.input_path)
-                audio = media.audio
-                
-            if audio is None:
+            # Open the audio stream on its own for both audio and video files, so
+            # analysis never spawns the extra ffmpeg readers a VideoFileClip does
+            audio = AudioFileClip(self.input_path)
+            if not audio.reader.infos['audio_found']:
                 raise Exception("No audio track found in the file!")
                 
             self.progress.emit(10)
             
-            # Analyze audio in chunks
             self.status.emit("Analyzing audio...")
-            audio_chunks = []
-            duration = media.duration
-            
-            # Process chunks
-            chunk_count = int(duration / self.chunk_duration)
-            for i, t in enumerate(np.arange(0, duration, self.chunk_duration)):
-                end_t = min(t + self.chunk_duration, duration)
-                if self.is_audio_only:
-                    chunk = audio.subclip(t, end_t)
-                else:
-                    chunk = media.subclip(t, end_t).audio
-                    
-                if chunk is not None:
-                    audio_chunks.append((t, np.sqrt(np.mean(chunk.to_soundarray()**2))))
-                progress = 10 + int((i / chunk_count) * 30)
-                self.progress.emit(progress)
-            
-            self.status.emit("Detecting silent parts...")
-            nonsilent_chunks = []
-            
-            for t, volume in audio_chunks:
-                if volume > self.threshold:
-                    nonsilent_chunks.append(t)
+            duration = audio.duration
+            # ffmpeg measures loudness while streaming the file, with no decode
+            # into numpy
+            loud = detect_loud_frames(
+                self.input_path, self.threshold, self.chunk_duration, audio.nchannels,
+                lambda seconds: self.progress.emit(10 + int(min(seconds / duration, 1) * 30))
+            )
+            if loud is not None:
+                spans = loud_spans(loud, self.chunk_duration, duration)
+            else:
+                spans = self.analyze_rms(audio, duration)
             
             self.progress.emit(50)
             self.status.emit("Creating clips...")
             
-            if not nonsilent_chunks:
+            if not spans:
                 raise Exception("No non-silent parts found in the media!")
             
-            clips = []
-            start_time = nonsilent_chunks[0]
-            prev_time = start_time
-            
-            for t in nonsilent_chunks[1:]:
-                if t - prev_time > self.chunk_duration * 1.5:
-                    clips.append(media.subclip(
-                        max(0, start_time - self.chunk_duration),
-                        min(duration, prev_time + self.chunk_duration)
-                    ))
-                    start_time = t
-                prev_time = t
-            
-            # Add the last clip
-            clips.append(media.subclip(
-                max(0, start_time - self.chunk_duration),
-                min(duration, prev_time + self.chunk_duration)
-            ))
-            
             self.progress.emit(70)
             self.status.emit("Combining clips...")
             
-            if clips:
-                output_path = os.path.splitext(self.input_path)[0] + "_no_silence"
+            output_path = os.path.splitext(self.input_path)[0] + "_no_silence"
+            
+            if self.is_audio_only:
+                # Add the appropriate extension based on input
+                ext = os.path.splitext(self.input_path)[1]
+                output_path += ext
                 
-                if self.is_audio_only:
+                self.status.emit("Saving audio...")
+                # Formats with a known packet grid are joined by copying packets,
+                # so no audio codec runs; anything else is re-encoded by moviepy.
+                # moviepy reports 'unknown' when it can't parse the sample rate,
+                # and snapping needs a real one
+                frame_samples = COPY_FRAME_SAMPLES.get(ext.lower())
+                sample_rate = audio.reader.infos.get('audio_fps')
+                copied = (
+                    frame_samples is not None
+                    and isinstance(sample_rate, int)
+                    and write_concat_copy(
+                        self.input_path,
+                        snap_spans(spans, sample_rate, frame_samples),
+                        output_path
+                    )
+                )
+                if not copied:
+                    clips = [audio.subclip(start, end) for start, end in spans]
                     final_media = concatenate_audioclips(clips)
-                    # Add the appropriate extension based on input
-                    ext = os.path.splitext(self.input_path)[1]
-                    output_path += ext
-                    
-                    self.status.emit("Saving audio...")
+                    # buffersize counts samples, so this writes ten seconds at
+                    # 44.1 kHz per block, about 7 MB of float64 stereo
                     final_media.write_audiofile(
                         output_path,
+                        nbytes=2,
+                        buffersize=441000,
                         logger=None
                     )
-                else:
-                    final_media = concatenate_videoclips(clips)
-                    output_path += ".mp4"
-                    
-                    self.status.emit("Saving video...")
-                    final_media.write_videofile(
-                        output_path,
-                        codec='libx264',
-                        audio_codec='aac',
-                        temp_audiofile="temp-audio.m4a",
-                        remove_temp=True,
-                        logger=None
-                    )
+                    final_media.close()
+            else:
+                output_path += ".mp4"
                 
-                final_media.close()
+                self.status.emit("Saving video...")
+                # Every span comes from the same file, so join them without
+                # re-encoding when every frame is a keyframe. Otherwise cut and
+                # re-encode them in one ffmpeg pass that muxes the audio directly,
+                # with no temporary audio file
+                fps = audio.reader.infos.get('video_fps')
+                has_fps = isinstance(fps, (int, float)) and fps > 0
+                copyable = is_intra_only(self.input_path)
+                # Cutting on the video frame grid gives each re-encoded span
+                # whole frames and the same length of audio, so concat has no
+                # gap to pad between them
+                encode_spans = snap_spans(spans, fps, 1) if has_fps else spans
+                if not ((copyable and write_concat_copy(self.input_path, spans, output_path))
+                        or write_segment_encode(self.input_path, encode_spans, output_path)):
+                    raise Exception("ffmpeg could not write the output video!")
             
-            media.close()
             self.progress.emit(100)
             self.finished.emit(output_path)
             
         except Exception as e:
             self.error.emit(str(e))
+        finally:
+            if audio is not None:
+                audio.close()
 
 class MainWindow(QMainWindow):
     def __init__(self):